@@ -11,22 +11,37 @@ The script performs three tasks:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import hashlib
 import json
+import mmap
+import os
 import re
 import subprocess
 import sys
+import tempfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+try:  # pragma: no cover - optional accelerator
+    import orjson
+except ImportError:
+    orjson = None
+
 from packaging.requirements import InvalidRequirement, Requirement
 from packaging.specifiers import SpecifierSet
 from packaging.version import InvalidVersion, Version
 
 
 GIT_CLONE_FLAGS: Tuple[str, ...] = (
+    "--quiet",
     "--depth=1",
+    "--filter=blob:none",
+    "--single-branch",
     "--no-tags",
     "--recurse-submodules",
     "--shallow-submodules",
@@ -117,6 +132,7 @@ def load_json(path: Path) -> Dict[str, object]:
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_git_url(candidate: Optional[str]) -> Optional[str]:
     if not candidate:
         return None
@@ -131,8 +147,21 @@ def normalize_git_url(candidate: Optional[str]) -> Optional[str]:
     return None
 
 
+# Lowercase ASCII alnum and "._-" map to themselves; every other byte becomes
+# a space so runs of disallowed characters collapse to one separator below.
+_SLUG_TABLE = bytes.maketrans(
+    bytes(range(256)),
+    bytes(
+        ord(chr(c).lower()) if c < 128 and (chr(c).isalnum() or chr(c) in "._-") else ord(" ")
+        for c in range(256)
+    ),
+)
+
+
+@functools.lru_cache(maxsize=1024)
 def slugify(name: str) -> str:
-    cleaned = re.sub(r"[^a-zA-Z0-9._-]+", "-", name).strip("-").lower()
+    translated = name.encode("ascii", "replace").translate(_SLUG_TABLE).decode("ascii")
+    cleaned = "-".join(translated.split()).strip("-")
     return cleaned or "custom-node"
 
 
@@ -162,6 +191,7 @@ def plan_plugins(deps: Dict[str, object]) -> Tuple[List[PluginPlan], List[str]]:
     plans: List[PluginPlan] = []
     unresolved_nodes: List[str] = list(map(str, deps.get("unresolved_nodes", []) or []))
     used_slugs: Set[str] = set()
+    plans_by_repo: Dict[str, PluginPlan] = {}
 
     if not isinstance(raw_plugins, Sequence):
         return plans, unresolved_nodes
@@ -187,61 +217,169 @@ def plan_plugins(deps: Dict[str, object]) -> Tuple[List[PluginPlan], List[str]]:
             if repo_url:
                 reason = "plugin_id"
 
+        if repo_url is not None:
+            existing = plans_by_repo.get(repo_url)
+            if existing is not None:
+                # Two workflow entries resolved to the same repository; merge
+                # their node lists instead of planning a redundant clone.
+                existing.nodes.extend(node for node in nodes if node not in existing.nodes)
+                continue
+
         slug = derive_slug(repo_url, used_slugs) if repo_url else None
-        plans.append(
-            PluginPlan(
-                plugin_id=plugin_id or "<unknown>",
-                nodes=nodes,
-                repo_url=repo_url,
-                slug=slug,
-                reason=reason,
-            )
+        plan = PluginPlan(
+            plugin_id=plugin_id or "<unknown>",
+            nodes=nodes,
+            repo_url=repo_url,
+            slug=slug,
+            reason=reason,
         )
+        plans.append(plan)
+        if repo_url is not None:
+            plans_by_repo[repo_url] = plan
 
     return plans, unresolved_nodes
 
 
-def clone_plugin(plan: PluginPlan, root: Path) -> PluginPlan:
+async def clone_plugin(plan: PluginPlan, root: Path, semaphore: asyncio.Semaphore) -> PluginPlan:
     if plan.repo_url is None or plan.slug is None:
         plan.status = "skipped"
         plan.message = "未找到可用的仓库地址"
         return plan
 
     target_dir = root / plan.slug
-    if target_dir.exists():
+    # Claim the target with a single mkdir instead of an exists() probe; git
+    # happily clones into an empty directory, and a concurrent claimer loses
+    # the race here rather than mid-clone.
+    try:
+        target_dir.mkdir()
+    except FileExistsError:
         plan.status = "skipped"
         plan.message = "目录已存在，跳过克隆"
         plan.requirements = find_requirement_files(target_dir)
         return plan
 
-    target_dir.parent.mkdir(parents=True, exist_ok=True)
     cmd = ["git", "clone", *GIT_CLONE_FLAGS, plan.repo_url, str(target_dir)]
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        plan.status = "cloned"
-        plan.requirements = find_requirement_files(target_dir)
+        # Spool stderr to an unnamed temp file; it is only read on failure,
+        # so the parent never shuffles pipe buffers for successful clones.
+        with tempfile.TemporaryFile() as stderr_file:
+            async with semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=subprocess.DEVNULL, stderr=stderr_file
+                )
+                returncode = await process.wait()
+            if returncode == 0:
+                plan.status = "cloned"
+                plan.requirements = find_requirement_files(target_dir)
+            else:
+                plan.status = "failed"
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="ignore")
+                plan.message = stderr.strip() or "git clone 执行失败"
     except FileNotFoundError:
         plan.status = "failed"
         plan.message = "未找到 git 可执行文件"
-    except subprocess.CalledProcessError as exc:
-        plan.status = "failed"
-        stderr = exc.stderr.decode("utf-8", errors="ignore") if exc.stderr else ""
-        plan.message = stderr.strip() or "git clone 执行失败"
+
+    if plan.status == "failed":
+        # Remove the claimed directory (if still empty) so a rerun retries
+        # the clone instead of treating the leftover as an existing plugin.
+        try:
+            target_dir.rmdir()
+        except OSError:
+            pass
     return plan
 
 
+async def clone_plugins(plans: Sequence[PluginPlan], root: Path) -> List[PluginPlan]:
+    # Keep every clone in flight at once but cap concurrent git processes.
+    semaphore = asyncio.Semaphore(8)
+    return list(await asyncio.gather(*(clone_plugin(plan, root, semaphore) for plan in plans)))
+
+
 def find_requirement_files(plugin_dir: Path) -> List[Path]:
     results: List[Path] = []
-    for candidate in sorted(plugin_dir.glob("requirements*")):
-        if candidate.is_file():
-            results.append(candidate)
-    standalone = plugin_dir / "requirements"
-    if standalone.is_file():
-        results.append(standalone)
+    try:
+        with os.scandir(plugin_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("requirements") and entry.is_file(follow_symlinks=False):
+                    results.append(Path(entry.path))
+    except OSError:  # pragma: no cover - defensive
+        pass
+    # Directory order is fine here; the summary sorts for stable output.
     return results
 
 
-REQ_PATTERN = re.compile(r"^\s*([A-Za-z0-9_.-]+(?:\[[A-Za-z0-9_,.-]+\])?)")
+_REQ_CACHE_PATH = Path(".req_parse_cache.json")
+
+
+@dataclass
+class RequirementParseCache:
+    """Persist parsed requirement lines keyed by file name and content hash."""
+
+    path: Path
+    entries: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    used: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path = _REQ_CACHE_PATH) -> "RequirementParseCache":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            data = {}
+        return cls(path=path, entries=data if isinstance(data, dict) else {})
+
+    def parse_file(self, req_file: Path) -> List[RequirementEntry]:
+        try:
+            with req_file.open("rb") as handle:
+                try:
+                    view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty files cannot be mapped
+                    return []
+                with view:
+                    cache_key = f"{req_file.name}:{hashlib.sha1(view).hexdigest()}"
+                    cached = self.entries.get(cache_key)
+                    if cached is None:
+                        parsed = _parse_requirement_bytes(view)
+                        cached = [{"original": e.original, "kind": e.kind, "key": e.key} for e in parsed]
+                        self.entries[cache_key] = cached
+        except Exception:  # pragma: no cover - defensive
+            return []
+        self.used[cache_key] = cached
+        return [RequirementEntry(**item) for item in cached]
+
+    def save(self) -> None:
+        # Only keep entries touched by this run so stale hashes do not pile up.
+        tmp_path = self.path.with_suffix(".json.tmp")
+        try:
+            tmp_path.write_text(json.dumps(self.used), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except Exception:  # pragma: no cover - cache is best-effort
+            pass
+
+
+def _parse_requirement_bytes(view: mmap.mmap) -> List[RequirementEntry]:
+    """Split a mapped requirements file on raw newlines, decoding only useful lines."""
+    entries: List[RequirementEntry] = []
+    size = len(view)
+    pos = 0
+    while pos < size:
+        newline = view.find(b"\n", pos)
+        if newline == -1:
+            newline = size
+        line = view[pos:newline].strip()
+        pos = newline + 1
+        if not line or line.startswith(b"#"):
+            continue
+        entry = parse_requirement_line(line.decode("utf-8", errors="ignore"))
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+REQ_PATTERN = re.compile(r"^\s*([A-Za-z0-9_.-]+(?:\[[A-Za-z0-9_,.-]+\])?)", re.ASCII)
+
+_SKIP_PREFIXES = ("-r ", "--requirement", "--requirements", "-c ", "--constraint")
+_VCS_PREFIXES = ("-e ", "--editable")
 
 
 def parse_requirement_line(line: str) -> Optional[RequirementEntry]:
@@ -249,113 +387,125 @@ def parse_requirement_line(line: str) -> Optional[RequirementEntry]:
     if not stripped or stripped.startswith("#"):
         return None
     lowered = stripped.lower()
-    if lowered.startswith(("-r ", "--requirement", "--requirements", "-c ", "--constraint")):
+    # Fast path: most lines are plain "name<op>version" with no option
+    # prefix, VCS reference or direct URL, so skip the prefix checks.
+    if stripped[0].isalnum() and "@" not in stripped and "git+" not in lowered:
+        match = REQ_PATTERN.match(lowered)
+        if match:
+            return RequirementEntry(
+                original=stripped, kind="package", key=match.group(1).replace("_", "-")
+            )
+    if lowered.startswith(_SKIP_PREFIXES):
         return None
-    if "git+" in lowered or lowered.startswith(("-e ", "--editable")):
+    if "git+" in lowered or lowered.startswith(_VCS_PREFIXES):
         return RequirementEntry(original=stripped, kind="vcs", key=lowered)
-    if "@" in stripped:
-        name, _rest = stripped.split("@", 1)
-        base = name.strip()
+    # Match against the lowered text so the key needs no second lower() pass.
+    if "@" in lowered:
+        base = lowered.split("@", 1)[0].strip()
     else:
-        match = REQ_PATTERN.match(stripped)
+        match = REQ_PATTERN.match(lowered)
         if not match:
             return RequirementEntry(original=stripped, kind="other", key=lowered)
         base = match.group(1)
-    normalized = base.replace("_", "-").lower()
-    return RequirementEntry(original=stripped, kind="package", key=normalized)
+    return RequirementEntry(original=stripped, kind="package", key=base.replace("_", "-"))
 
 
-def load_known_requirements(paths: Iterable[Path]) -> Tuple[Set[str], Set[str]]:
-    packages: Set[str] = set()
-    vcs_entries: Set[str] = set()
+def load_known_requirements(
+    paths: Iterable[Path], parse_cache: RequirementParseCache
+) -> Set[str]:
+    # One set keyed by "kind:key" keeps the hot loops to a single lookup.
+    known: Set[str] = set()
     for path in paths:
         if not path.exists():
             continue
-        try:
-            lines = path.read_text(encoding="utf-8").splitlines()
-        except Exception:  # pragma: no cover - defensive
-            continue
-        for line in lines:
-            entry = parse_requirement_line(line)
-            if entry is None:
-                continue
-            if entry.kind == "package":
-                packages.add(entry.key)
-            elif entry.kind == "vcs":
-                vcs_entries.add(entry.key)
-    return packages, vcs_entries
+        known.update(f"{entry.kind}:{entry.key}" for entry in parse_cache.parse_file(path))
+    return known
 
 
 def collect_requirements(
     plans: Sequence[PluginPlan],
     requirements_output: Path,
-    known_packages: Set[str],
-    known_vcs: Set[str],
+    known_requirements: Set[str],
+    parse_cache: RequirementParseCache,
 ) -> Tuple[List[str], Dict[str, object]]:
     packages: Dict[str, PackageAccumulator] = {}
     raw_lines: List[str] = []
-    raw_seen = set(known_vcs)
+    raw_seen = known_requirements.copy()
+    # Bind the hot-loop methods once instead of per line.
+    mark_seen = raw_seen.add
+    keep_raw = raw_lines.append
     resolution_notes: Dict[str, object] = {
         "packages": {},
         "version_conflicts": [],
         "raw_requirements": [],
     }
 
-    for plan in plans:
-        if plan.status not in {"cloned", "skipped"}:
-            continue
-        for req_file in plan.requirements:
-            try:
-                lines = req_file.read_text(encoding="utf-8").splitlines()
-            except Exception:
-                continue
-            source_label = f"{plan.plugin_id}:{req_file.name}"
-            for line in lines:
-                entry = parse_requirement_line(line)
-                if entry is None:
-                    continue
-                if entry.kind == "package":
-                    if entry.key in known_packages:
-                        continue
-                    try:
-                        requirement = Requirement(entry.original)
-                    except InvalidRequirement:
-                        identifier = f"invalid:{entry.original.lower()}"
-                        if identifier in raw_seen:
-                            continue
-                        raw_seen.add(identifier)
-                        raw_lines.append(entry.original)
+    req_files = [
+        (plan, req_file)
+        for plan in plans
+        if plan.status in {"cloned", "skipped"}
+        for req_file in plan.requirements
+    ]
+    # Parse all files up front in worker threads; the map/hash/decode work
+    # releases the GIL, and the merge below stays single-threaded.
+    parsed_files: List[List[RequirementEntry]] = []
+    if req_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(req_files))) as executor:
+            parsed_files = list(executor.map(lambda item: parse_cache.parse_file(item[1]), req_files))
+
+    for (plan, req_file), entries in zip(req_files, parsed_files):
+        source_label = f"{plan.plugin_id}:{req_file.name}"
+        package_entries: List[RequirementEntry] = []
+        file_raw: Dict[str, str] = {}
+        for entry in entries:
+            if entry.kind == "package":
+                package_entries.append(entry)
+            else:
+                file_raw.setdefault(f"{entry.kind}:{entry.key}", entry.original)
+
+        # One C-level set difference per file instead of a membership test
+        # and an add per line.
+        new_raw = file_raw.keys() - raw_seen
+        if new_raw:
+            raw_lines.extend(original for key, original in file_raw.items() if key in new_raw)
+            raw_seen |= new_raw
+
+        new_packages = {f"package:{entry.key}" for entry in package_entries} - known_requirements
+        for entry in package_entries:
+            if f"package:{entry.key}" in new_packages:
+                try:
+                    requirement = Requirement(entry.original)
+                except InvalidRequirement:
+                    identifier = f"invalid:{entry.original.lower()}"
+                    if identifier in raw_seen:
                         continue
+                    mark_seen(identifier)
+                    keep_raw(entry.original)
+                    continue
 
-                    normalized = requirement.name.replace("_", "-").lower()
-                    accumulator = packages.get(normalized)
-                    if accumulator is None:
-                        accumulator = PackageAccumulator(name=requirement.name)
-                        packages[normalized] = accumulator
-                    accumulator.records.append(
-                        RequirementRecord(
-                            requirement=requirement,
-                            original=entry.original,
-                            source=source_label,
-                            plugin_id=plan.plugin_id,
-                            file=str(req_file),
-                        )
+                normalized = requirement.name.replace("_", "-").lower()
+                accumulator = packages.get(normalized)
+                if accumulator is None:
+                    accumulator = PackageAccumulator(name=requirement.name)
+                    packages[normalized] = accumulator
+                accumulator.records.append(
+                    RequirementRecord(
+                        requirement=requirement,
+                        original=entry.original,
+                        source=source_label,
+                        plugin_id=plan.plugin_id,
+                        file=str(req_file),
                     )
-                    accumulator.extras.update(requirement.extras)
-                    if requirement.marker:
-                        accumulator.markers.append(str(requirement.marker))
-                    for spec in requirement.specifier:
-                        spec_text = str(spec).strip()
-                        if spec_text:
-                            accumulator.spec_parts.append(spec_text)
-                        if spec.operator in {"==", "==="} and spec.version is not None:
-                            accumulator.eq_versions.add(spec.version)
-                else:
-                    identifier = entry.key if entry.kind == "vcs" else f"{entry.kind}:{entry.key}"
-                    if identifier in raw_seen:
-                        continue
-                    raw_seen.add(identifier)
-                    raw_lines.append(entry.original)
+                )
+                accumulator.extras.update(requirement.extras)
+                if requirement.marker:
+                    accumulator.markers.append(str(requirement.marker))
+                for spec in requirement.specifier:
+                    spec_text = str(spec).strip()
+                    if spec_text:
+                        accumulator.spec_parts.append(spec_text)
+                    if spec.operator in {"==", "==="} and spec.version is not None:
+                        accumulator.eq_versions.add(spec.version)
 
     final_map: Dict[str, Dict[str, object]] = {}
 
@@ -448,7 +598,7 @@ def write_summary(
                 "status": plan.status,
                 "reason": plan.reason,
                 "message": plan.message,
-                "requirements_files": [str(path) for path in plan.requirements],
+                "requirements_files": sorted(str(path) for path in plan.requirements),
             }
             for plan in plans
         ],
@@ -459,7 +609,13 @@ def write_summary(
         },
     }
     summary_output.parent.mkdir(parents=True, exist_ok=True)
-    summary_output.write_text(json.dumps(summary, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    if orjson is not None:
+        summary_output.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2) + b"\n")
+        return
+    # Stream straight into the file to avoid materializing the whole document.
+    with summary_output.open("w", encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
 
 
 def main() -> None:
@@ -485,14 +641,13 @@ def main() -> None:
 
     args.custom_node_root.mkdir(parents=True, exist_ok=True)
 
-    processed_plans: List[PluginPlan] = []
     missing_repos = 0
     clone_failures = 0
 
     print(f"[info] 需要处理的插件数量: {len(plans)}")
-    for plan in plans:
-        updated = clone_plugin(plan, args.custom_node_root)
-        processed_plans.append(updated)
+    processed_plans = asyncio.run(clone_plugins(plans, args.custom_node_root))
+
+    for updated in processed_plans:
         if updated.repo_url is None:
             print(f"[warn] 插件 {updated.plugin_id} 无法解析仓库地址。")
             missing_repos += 1
@@ -502,13 +657,15 @@ def main() -> None:
         else:
             print(f"[info] 插件 {updated.plugin_id} -> {updated.status} ({updated.slug})")
 
-    known_packages, known_vcs = load_known_requirements([args.pak3, args.pak7])
+    parse_cache = RequirementParseCache.load()
+    known_requirements = load_known_requirements([args.pak3, args.pak7], parse_cache)
     collected_requirements, resolution_details = collect_requirements(
         processed_plans,
         args.requirements_output,
-        known_packages,
-        known_vcs,
+        known_requirements,
+        parse_cache,
     )
+    parse_cache.save()
 
     if collected_requirements:
         print(f"[info] 新增依赖 {len(collected_requirements)} 条，已写入 {args.requirements_output}")
@@ -13,14 +13,52 @@ from __future__ import annotations
 import argparse
 import ast
 import json
+import mmap
+import os
 import re
+import shutil
 import subprocess
 import sys
-from collections import defaultdict
+import tarfile
+import tempfile
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
 from urllib.parse import urlparse
 
+try:  # pragma: no cover - optional accelerator
+    import ijson
+except ImportError:
+    ijson = None
+
+try:  # pragma: no cover - optional accelerator
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Below this size the mmap setup costs more than the copy it saves.
+_MMAP_THRESHOLD = 256 * 1024
+
+
+def _load_json(path: Path) -> object:
+    """Parse a JSON file from raw bytes, via orjson when it is installed."""
+    if orjson is not None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        if size >= _MMAP_THRESHOLD:
+            # orjson accepts any buffer, so parse straight off the mapping
+            # without copying the file into an intermediate bytes object.
+            with path.open("rb") as handle:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    return orjson.loads(memoryview(view))
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -108,9 +146,58 @@ class NodeClassCollector(ast.NodeVisitor):
                 self._collect_from_node(arg)
 
 
-def gather_builtin_nodes(comfy_root: Path) -> Set[str]:
+# Flat literal NODE_CLASS_MAPPINGS dicts are the overwhelmingly common
+# shape; these two scans extract their keys without a full AST parse.
+_NCM_BLOCK_RE = re.compile(r"NODE_CLASS_MAPPINGS[^{]*\{([^{}]*)\}", re.S)
+_NCM_KEY_RE = re.compile(r"""["']([A-Za-z0-9_ .\-]+)["']\s*:""")
+
+# Parsed node names keyed by source path; entries are [mtime, size, names].
+_BUILTIN_CACHE_PATH = Path(tempfile.gettempdir()) / "comfyui_builtin_nodes.json"
+
+
+def _load_builtin_cache() -> Dict[str, List[object]]:
+    try:
+        data = json.loads(_BUILTIN_CACHE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_builtin_cache(cache: Dict[str, List[object]]) -> None:
+    try:
+        tmp_path = _BUILTIN_CACHE_PATH.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(tmp_path, _BUILTIN_CACHE_PATH)
+    except Exception:  # pragma: no cover - cache is best-effort
+        pass
+
+
+def _parse_builtin_file(path: Path) -> List[str]:
+    try:
+        source = path.read_text(encoding="utf-8")
+    except Exception as exc:  # pragma: no cover - diagnostic output only
+        print(f"[warn] Could not parse {path}: {exc}", file=sys.stderr)
+        return []
+    if "NODE_CLASS_MAPPINGS" not in source:
+        return []
+
+    names: Set[str] = set()
+    for block in _NCM_BLOCK_RE.findall(source):
+        names.update(_NCM_KEY_RE.findall(block))
+    if names:
+        return sorted(names)
+
+    # Fallback for files that build the mapping programmatically.
     collector = NodeClassCollector()
+    try:
+        tree = ast.parse(source, filename=str(path))
+        collector.visit(tree)
+    except Exception as exc:  # pragma: no cover - diagnostic output only
+        print(f"[warn] Could not parse {path}: {exc}", file=sys.stderr)
+    return sorted(collector.node_names)
+
 
+def gather_builtin_nodes(comfy_root: Path) -> Set[str]:
     candidate_files: Set[Path] = set()
 
     root_nodes = comfy_root / "nodes.py"
@@ -122,21 +209,67 @@ def gather_builtin_nodes(comfy_root: Path) -> Set[str]:
         if base.is_dir():
             candidate_files.update(base.rglob("*.py"))
 
+    cache = _load_builtin_cache()
+    fresh_cache: Dict[str, List[object]] = {}
+    node_names: Set[str] = set()
+    stats: Dict[str, os.stat_result] = {}
+    misses: List[Path] = []
+
     for path in sorted(candidate_files):
+        key = str(path)
         try:
-            source = path.read_text(encoding="utf-8")
-            tree = ast.parse(source, filename=str(path))
-            collector.visit(tree)
-        except Exception as exc:  # pragma: no cover - diagnostic output only
-            print(f"[warn] Could not parse {path}: {exc}", file=sys.stderr)
+            stat = path.stat()
+        except OSError:
+            continue
+        stats[key] = stat
+        entry = cache.get(key)
+        if (
+            isinstance(entry, list)
+            and len(entry) == 3
+            and entry[0] == stat.st_mtime
+            and entry[1] == stat.st_size
+        ):
+            names = [name for name in entry[2] if isinstance(name, str)]
+            fresh_cache[key] = [stat.st_mtime, stat.st_size, names]
+            node_names.update(names)
+        else:
+            misses.append(path)
+
+    if misses:
+        # ast.parse is pure CPU work, so fan cold files out across cores;
+        # a couple of stragglers are not worth spawning workers for.
+        if len(misses) > 4:
+            with ProcessPoolExecutor() as executor:
+                parsed = list(executor.map(_parse_builtin_file, misses, chunksize=8))
+        else:
+            parsed = [_parse_builtin_file(path) for path in misses]
+        for path, names in zip(misses, parsed):
+            key = str(path)
+            stat = stats[key]
+            fresh_cache[key] = [stat.st_mtime, stat.st_size, names]
+            node_names.update(names)
 
-    return collector.node_names
+    _write_builtin_cache(fresh_cache)
+    return node_names
 
 
 def load_workflow_nodes(workflow_path: Path) -> Set[str]:
-    data = json.loads(workflow_path.read_text(encoding="utf-8"))
-    discovered: Set[str] = set()
+    harvested: Set[str] = set()
+    if orjson is None:
+        # The stdlib decoder calls object_hook on every dict exactly once,
+        # so class types for non-standard layouts can be harvested during
+        # the parse itself instead of a second traversal afterwards.
+        def _harvest(obj: Dict[str, object]) -> Dict[str, object]:
+            class_type = obj.get("class_type") or obj.get("type")
+            if isinstance(class_type, str):
+                harvested.add(class_type)
+            return obj
+
+        data = json.loads(workflow_path.read_bytes(), object_hook=_harvest)
+    else:
+        data = _load_json(workflow_path)
 
+    discovered: Set[str] = set()
     nodes_section = data.get("nodes")
     if isinstance(nodes_section, list):
         for node in nodes_section:
@@ -144,20 +277,22 @@ def load_workflow_nodes(workflow_path: Path) -> Set[str]:
                 class_type = node.get("class_type") or node.get("type")
                 if isinstance(class_type, str):
                     discovered.add(class_type)
+    elif orjson is None:
+        discovered = harvested
     else:
-        # Fallback: crawl entire structure in case of non-standard formats
-        def _scan(obj: object) -> None:
+        # Fallback: crawl entire structure in case of non-standard formats.
+        # An explicit stack avoids per-level call overhead and the recursion
+        # limit on deeply nested documents.
+        stack = deque([data])
+        while stack:
+            obj = stack.pop()
             if isinstance(obj, dict):
                 class_type = obj.get("class_type") or obj.get("type")
                 if isinstance(class_type, str):
                     discovered.add(class_type)
-                for value in obj.values():
-                    _scan(value)
+                stack.extend(obj.values())
             elif isinstance(obj, list):
-                for item in obj:
-                    _scan(item)
-
-        _scan(data)
+                stack.extend(obj)
 
     return discovered
 
@@ -176,7 +311,7 @@ def load_custom_node_catalog(manager_root: Path) -> Dict[str, Dict[str, object]]
         if not path.exists():
             continue
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = _load_json(path)
         except Exception as exc:
             print(f"[warn] Failed to parse custom node list {path}: {exc}", file=sys.stderr)
             continue
@@ -231,23 +366,64 @@ def derive_repository_from_raw(url: str) -> Optional[str]:
     return f"https://github.com/{owner}/{repo}"
 
 
+def iter_node_map_items(paths: Sequence[Path]) -> Iterable[Tuple[str, object]]:
+    """
+    Yield (plugin_id, value) pairs from the given node-map files in order.
+
+    Later files only contribute plugin ids not already seen, matching the
+    old setdefault-based merge. When ijson is available the files are
+    streamed entry by entry instead of being materialized as one dict.
+    """
+    seen: Set[str] = set()
+    for path in paths:
+        if ijson is not None:
+            with path.open("rb") as handle:
+                for raw_plugin_id, value in ijson.kvitems(handle, "", use_float=True):
+                    if raw_plugin_id in seen:
+                        continue
+                    seen.add(raw_plugin_id)
+                    yield raw_plugin_id, value
+            continue
+        data = _load_json(path)
+        if not isinstance(data, dict):
+            continue
+        for raw_plugin_id, value in data.items():
+            if raw_plugin_id in seen:
+                continue
+            seen.add(raw_plugin_id)
+            yield raw_plugin_id, value
+
+
+def _catalog_entry_defaults(custom_entry: Dict[str, object]) -> Dict[str, object]:
+    """Metadata defaults contributed by a custom-node-list catalog entry."""
+    defaults: Dict[str, object] = {
+        key: value
+        for key in ("reference", "author", "title", "install_type", "description")
+        if (value := custom_entry.get(key)) is not None
+    }
+    files = custom_entry.get("files")
+    if isinstance(files, Sequence) and not isinstance(files, str):
+        defaults["files"] = [item for item in files if isinstance(item, str)]
+    return defaults
+
+
 def load_extension_node_map(
-    raw_data: Dict[str, object],
+    raw_items: Iterable[Tuple[str, object]],
     custom_catalog: Dict[str, Dict[str, object]],
 ) -> Tuple[
-    Dict[str, List[str]],
+    Dict[str, str],
     Dict[str, Dict[str, object]],
     Dict[str, str],
     List[Tuple[Pattern[str], str]],
     Set[str],
 ]:
-    node_to_plugins: Dict[str, List[str]] = defaultdict(list)
+    node_first_plugin: Dict[str, str] = {}
     plugin_metadata: Dict[str, Dict[str, object]] = {}
     preemption_map: Dict[str, str] = {}
     pattern_entries: List[Tuple[Pattern[str], str]] = []
     comfy_nodes: Set[str] = set()
 
-    for raw_plugin_id, value in raw_data.items():
+    for raw_plugin_id, value in raw_items:
         nodes: List[str] = []
         metadata: Dict[str, object] = {}
 
@@ -256,65 +432,45 @@ def load_extension_node_map(
             if isinstance(first, list):
                 nodes = [entry for entry in first if isinstance(entry, str)]
             if rest and isinstance(rest[0], dict):
-                metadata = {k: v for k, v in rest[0].items()}
+                metadata = rest[0]
         elif isinstance(value, dict):
             metadata = value
 
         canonical_id = raw_plugin_id
         custom_entry = custom_catalog.get(raw_plugin_id)
+        # combined_metadata aliases metadata until a merge produces a new
+        # dict; map-entry values always win over catalog defaults.
+        combined_metadata = metadata
         if custom_entry:
             reference = custom_entry.get("reference")
             if isinstance(reference, str) and reference:
                 canonical_id = reference
-            combined_metadata = dict(metadata)
-            combined_metadata.setdefault("reference", custom_entry.get("reference"))
-            combined_metadata.setdefault("author", custom_entry.get("author"))
-            combined_metadata.setdefault("title", custom_entry.get("title"))
-            combined_metadata.setdefault("install_type", custom_entry.get("install_type"))
-            description = custom_entry.get("description")
-            if description and "description" not in combined_metadata:
-                combined_metadata["description"] = description
-            files = custom_entry.get("files")
-            if isinstance(files, Sequence) and not isinstance(files, str):
-                combined_metadata.setdefault("files", [item for item in files if isinstance(item, str)])
         else:
             derived_repo = derive_repository_from_raw(raw_plugin_id)
             if derived_repo:
                 canonical_id = derived_repo
-                combined_metadata = dict(metadata)
-                combined_metadata.setdefault("derived_from", raw_plugin_id)
-            else:
-                combined_metadata = metadata
+                combined_metadata = {"derived_from": raw_plugin_id} | metadata
+                custom_entry = custom_catalog.get(canonical_id)
 
-        if not custom_entry and canonical_id != raw_plugin_id:
-            custom_entry = custom_catalog.get(canonical_id)
+        # Plugin ids and node names repeat heavily across map entries;
+        # interning lets the dicts share one object per distinct string.
+        canonical_id = sys.intern(canonical_id)
 
         if custom_entry:
-            combined_metadata.setdefault("reference", custom_entry.get("reference"))
-            combined_metadata.setdefault("author", custom_entry.get("author"))
-            combined_metadata.setdefault("title", custom_entry.get("title"))
-            combined_metadata.setdefault("install_type", custom_entry.get("install_type"))
-            description = custom_entry.get("description")
-            if description and "description" not in combined_metadata:
-                combined_metadata["description"] = description
-            files = custom_entry.get("files")
-            if isinstance(files, Sequence) and not isinstance(files, str):
-                combined_metadata.setdefault("files", [item for item in files if isinstance(item, str)])
-        elif canonical_id == raw_plugin_id:
-            combined_metadata = metadata
+            combined_metadata = _catalog_entry_defaults(custom_entry) | combined_metadata
 
         existing_meta = plugin_metadata.get(canonical_id)
         if existing_meta:
-            merged = dict(existing_meta)
-            merged.update({k: v for k, v in combined_metadata.items() if v is not None})
-            plugin_metadata[canonical_id] = merged
+            plugin_metadata[canonical_id] = existing_meta | {
+                k: v for k, v in combined_metadata.items() if v is not None
+            }
         else:
             plugin_metadata[canonical_id] = combined_metadata
 
         for node_name in nodes:
             normalized = node_name.strip()
             if normalized:
-                node_to_plugins[normalized].append(canonical_id)
+                node_first_plugin.setdefault(sys.intern(normalized), canonical_id)
 
         if canonical_id == "https://github.com/comfyanonymous/ComfyUI":
             comfy_nodes.update(node.strip() for node in nodes if isinstance(node, str))
@@ -323,7 +479,7 @@ def load_extension_node_map(
         if isinstance(preemptions, Sequence) and not isinstance(preemptions, str):
             for entry in preemptions:
                 if isinstance(entry, str):
-                    preemption_map[entry] = canonical_id
+                    preemption_map[sys.intern(entry)] = canonical_id
 
         pattern = metadata.get("nodename_pattern")
         if isinstance(pattern, str) and pattern:
@@ -333,62 +489,137 @@ def load_extension_node_map(
                 continue
             pattern_entries.append((compiled, canonical_id))
 
-    return node_to_plugins, plugin_metadata, preemption_map, pattern_entries, comfy_nodes
+    return node_first_plugin, plugin_metadata, preemption_map, pattern_entries, comfy_nodes
+
+
+def combine_pattern_entries(
+    pattern_entries: Sequence[Tuple[Pattern[str], str]],
+) -> Tuple[Optional[Pattern[str]], List[str], List[Tuple[Pattern[str], str]]]:
+    """
+    Fuse per-plugin nodename patterns into a single alternation regex.
+
+    Returns the union pattern (group ``pN`` maps to index N of the returned
+    plugin list) plus the entries that could not be folded in and must keep
+    using a per-pattern search.
+    """
+    wrapped: List[str] = []
+    group_plugins: List[str] = []
+    leftovers: List[Tuple[Pattern[str], str]] = []
+
+    for pattern, plugin_id in pattern_entries:
+        candidate = f"(?P<p{len(group_plugins)}>{pattern.pattern})"
+        try:
+            re.compile(candidate)
+        except re.error:  # e.g. inline flags that only work at pattern start
+            leftovers.append((pattern, plugin_id))
+            continue
+        wrapped.append(candidate)
+        group_plugins.append(plugin_id)
+
+    if not wrapped:
+        return None, [], leftovers
+
+    try:
+        union = re.compile("|".join(wrapped))
+    except re.error:  # pragma: no cover - cross-pattern interaction
+        return None, [], list(pattern_entries)
+    return union, group_plugins, leftovers
+
+
+def combine_builtin_patterns(
+    patterns: Sequence[Pattern[str]],
+) -> Tuple[Optional[Pattern[str]], List[Pattern[str]]]:
+    """Union builtin-node regexes so the per-node check is one search."""
+    parts: List[str] = []
+    leftovers: List[Pattern[str]] = []
+
+    for pattern in patterns:
+        candidate = f"(?:{pattern.pattern})"
+        try:
+            re.compile(candidate)
+        except re.error:
+            leftovers.append(pattern)
+            continue
+        parts.append(candidate)
+
+    if not parts:
+        return None, leftovers
+
+    try:
+        return re.compile("|".join(parts)), leftovers
+    except re.error:  # pragma: no cover - cross-pattern interaction
+        return None, list(patterns)
 
 
 def resolve_dependencies(
     workflow_nodes: Set[str],
-    builtin_nodes: Set[str],
+    builtin_nodes: FrozenSet[str],
+    builtin_union: Optional[Pattern[str]],
     builtin_patterns: Sequence[Pattern[str]],
-    node_to_plugins: Dict[str, List[str]],
+    node_first_plugin: Dict[str, str],
     plugin_metadata: Dict[str, Dict[str, object]],
     preemption_map: Dict[str, str],
+    pattern_union: Optional[Pattern[str]],
+    pattern_union_plugins: Sequence[str],
     pattern_entries: List[Tuple[Pattern[str], str]],
     plugin_overrides: Dict[str, str],
 ) -> Tuple[List[Dict[str, object]], List[str]]:
     plugins: Dict[str, Dict[str, object]] = {}
     unresolved: Set[str] = set()
 
-    for node_name in sorted(workflow_nodes):
-        if node_name in builtin_nodes or any(pattern.search(node_name) for pattern in builtin_patterns):
-            continue
-        override_plugin = plugin_overrides.get(node_name)
-        plugin_id: Optional[str]
-        plugin_ids = node_to_plugins.get(node_name)
-
-        if override_plugin is not None:
-            plugin_id = override_plugin
-        else:
-            plugin_id = preemption_map.get(node_name)
-            if plugin_id is None and plugin_ids:
-                plugin_id = plugin_ids[0]
-
-            if plugin_id is None:
-                for pattern, candidate_plugin in pattern_entries:
-                    if pattern.search(node_name):
-                        plugin_id = candidate_plugin
-                        break
-
-        if plugin_id is None and plugin_ids:
-            plugin_id = plugin_ids[0]
-
-        if plugin_id is None:
-            unresolved.add(node_name)
-            continue
-
+    def record(plugin_id: str, node_name: str) -> None:
         entry = plugins.setdefault(
             plugin_id,
             {
                 "id": plugin_id,
-                "nodes": set(),  # type: ignore[dict-item]
+                "nodes": [],  # type: ignore[dict-item]
                 "metadata": plugin_metadata.get(plugin_id, {}),
             },
         )
-        entry["nodes"].add(node_name)  # type: ignore[arg-type]
+        entry["nodes"].append(node_name)  # type: ignore[arg-type]
+
+    # Narrow the workload with set arithmetic before any per-node Python
+    # work: most workflow nodes are builtin and drop out in C code here.
+    candidates = workflow_nodes - builtin_nodes
+    if builtin_union is not None:
+        candidates = {name for name in candidates if not builtin_union.search(name)}
+    if builtin_patterns:
+        candidates = {
+            name
+            for name in candidates
+            if not any(pattern.search(name) for pattern in builtin_patterns)
+        }
+    if plugin_overrides:
+        for node_name in candidates & plugin_overrides.keys():
+            record(plugin_overrides[node_name], node_name)
+        candidates -= plugin_overrides.keys()
+
+    # Iteration order does not matter: every emitted list is sorted below.
+    for node_name in candidates:
+        plugin_id: Optional[str] = preemption_map.get(node_name)
+        if plugin_id is None:
+            plugin_id = node_first_plugin.get(node_name)
+
+        if plugin_id is None and pattern_union is not None:
+            match = pattern_union.search(node_name)
+            if match is not None and match.lastgroup is not None:
+                plugin_id = pattern_union_plugins[int(match.lastgroup[1:])]
+
+        if plugin_id is None:
+            for pattern, candidate_plugin in pattern_entries:
+                if pattern.search(node_name):
+                    plugin_id = candidate_plugin
+                    break
+
+        if plugin_id is None:
+            unresolved.add(node_name)
+            continue
+
+        record(plugin_id, node_name)
 
     plugin_list: List[Dict[str, object]] = []
     for plugin_id, entry in sorted(plugins.items(), key=lambda item: item[0]):
-        node_list = sorted(entry["nodes"])  # type: ignore[arg-type]
+        node_list = sorted(set(entry["nodes"]))  # type: ignore[arg-type]
         plugin_entry = {"id": plugin_id, "nodes": node_list}
         if entry["metadata"]:
             plugin_entry["metadata"] = entry["metadata"]
@@ -397,20 +628,22 @@ def resolve_dependencies(
     return plugin_list, sorted(unresolved)
 
 
-def load_special_config(path: Optional[Path]) -> Tuple[Set[str], List[Pattern[str]], Dict[str, str]]:
+def load_special_config(
+    path: Optional[Path],
+) -> Tuple[Set[str], Optional[Pattern[str]], List[Pattern[str]], Dict[str, str]]:
     builtin_overrides: Set[str] = set()
     builtin_patterns: List[Pattern[str]] = []
     plugin_overrides: Dict[str, str] = {}
 
     if path is None:
-        return builtin_overrides, builtin_patterns, plugin_overrides
+        return builtin_overrides, None, builtin_patterns, plugin_overrides
 
     if not path.exists():
         print(f"[error] Special config not found: {path}", file=sys.stderr)
         sys.exit(1)
 
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = _load_json(path)
     except Exception as exc:
         print(f"[error] Failed to parse special config {path}: {exc}", file=sys.stderr)
         sys.exit(1)
@@ -429,15 +662,18 @@ def load_special_config(path: Optional[Path]) -> Tuple[Set[str], List[Pattern[st
     if isinstance(plugin_map, dict):
         for node_name, plugin_id in plugin_map.items():
             if isinstance(node_name, str) and isinstance(plugin_id, str):
-                plugin_overrides[node_name] = plugin_id
+                plugin_overrides[sys.intern(node_name)] = sys.intern(plugin_id)
+
+    builtin_union, builtin_patterns = combine_builtin_patterns(builtin_patterns)
+    return builtin_overrides, builtin_union, builtin_patterns, plugin_overrides
 
-    return builtin_overrides, builtin_patterns, plugin_overrides
+
+_REGEX_TOKENS = frozenset(".*+?[](){}|^$")
 
 
 def _maybe_compile_pattern(value: str) -> Optional[Pattern[str]]:
     """Attempt to detect and compile regex-like builtin node declarations."""
-    regex_tokens = set(".*+?[](){}|^$")
-    if not any(token in value for token in regex_tokens):
+    if not any(token in value for token in _REGEX_TOKENS):
         return None
     try:
         return re.compile(value)
@@ -446,10 +682,41 @@ def _maybe_compile_pattern(value: str) -> Optional[Pattern[str]]:
         return None
 
 
+def _download_repo_tarball(repo_url: str, dest: Path) -> bool:
+    """Fetch and unpack the default-branch tarball of a GitHub repository."""
+    tarball_url = f"{repo_url}/archive/HEAD.tar.gz"
+    tmp_dir: Optional[Path] = None
+    try:
+        tmp_dir = Path(tempfile.mkdtemp(dir=dest.parent))
+        with urllib.request.urlopen(tarball_url, timeout=60) as response:
+            with tarfile.open(fileobj=response, mode="r|gz") as archive:
+                try:
+                    archive.extractall(tmp_dir, filter="data")
+                except TypeError:  # Python without the tarfile filter argument
+                    archive.extractall(tmp_dir)
+        entries = list(tmp_dir.iterdir())
+        if len(entries) != 1 or not entries[0].is_dir():
+            raise OSError("unexpected tarball layout")
+        entries[0].rename(dest)
+        tmp_dir.rmdir()
+        return True
+    except Exception as exc:
+        print(f"[warn] Tarball download failed for {repo_url}: {exc}", file=sys.stderr)
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+
+
 def ensure_repo(path: Path, repo_url: str) -> Path:
     if path.exists():
         return path
 
+    # A plain HTTP tarball skips the git process fork and protocol
+    # negotiation; git clone remains as the fallback.
+    print(f"[info] Downloading {repo_url} into {path}", file=sys.stderr)
+    if _download_repo_tarball(repo_url, path):
+        return path
+
     print(f"[info] Cloning {repo_url} into {path}", file=sys.stderr)
     try:
         subprocess.run(
@@ -480,12 +747,11 @@ def main() -> None:
     comfy_root = ensure_repo(comfy_root, "https://github.com/comfyanonymous/ComfyUI") if not comfy_root.exists() else comfy_root
     manager_root = ensure_repo(manager_root, "https://github.com/Comfy-Org/ComfyUI-Manager") if not manager_root.exists() else manager_root
 
-    required_manager_files = [
-        manager_root / "node_db" / "new" / "extension-node-map.json",
-    ]
-    if not any(path.exists() for path in required_manager_files):
+    preferred_node_map = manager_root / "node_db" / "new" / "extension-node-map.json"
+    if not preferred_node_map.exists():
         fallback_root = manager_root.parent / f"{manager_root.name}-download"
         manager_root = ensure_repo(fallback_root, "https://github.com/Comfy-Org/ComfyUI-Manager")
+        preferred_node_map = manager_root / "node_db" / "new" / "extension-node-map.json"
 
     required_comfy_files = [
         comfy_root / "nodes.py",
@@ -498,57 +764,53 @@ def main() -> None:
     workflow_nodes = load_workflow_nodes(args.workflow)
     builtin_nodes = gather_builtin_nodes(comfy_root)
 
-    node_map_data: Optional[Dict[str, object]] = None
+    node_map_paths: List[Path] = []
     if args.node_map:
         node_map_path = args.node_map
         if not node_map_path.exists():
             print(f"[error] Could not find extension-node-map.json at {node_map_path}", file=sys.stderr)
             sys.exit(1)
-        node_map_data = json.loads(node_map_path.read_text(encoding="utf-8"))
+        node_map_paths.append(node_map_path)
     else:
-        preferred = manager_root / "node_db" / "new" / "extension-node-map.json"
         fallback_path = manager_root / "extension-node-map.json"
-        if preferred.exists():
-            node_map_data = json.loads(preferred.read_text(encoding="utf-8"))
-            if fallback_path.exists():
-                fallback_data = json.loads(fallback_path.read_text(encoding="utf-8"))
-                for key, value in fallback_data.items():
-                    node_map_data.setdefault(key, value)
-        elif fallback_path.exists():
-            node_map_data = json.loads(fallback_path.read_text(encoding="utf-8"))
-        else:
+        node_map_paths.extend(
+            path for path in (preferred_node_map, fallback_path) if path.exists()
+        )
+        if not node_map_paths:
             print(
-                f"[error] Could not find extension-node-map.json at either {preferred} or {fallback_path}",
+                f"[error] Could not find extension-node-map.json at either {preferred_node_map} or {fallback_path}",
                 file=sys.stderr,
             )
             sys.exit(1)
 
-    if node_map_data is None:
-        print("[error] Failed to load extension-node-map.json data.", file=sys.stderr)
-        sys.exit(1)
-
-    builtin_overrides, builtin_patterns, plugin_overrides = load_special_config(args.special_config)
+    builtin_overrides, builtin_union, builtin_patterns, plugin_overrides = load_special_config(
+        args.special_config
+    )
 
     custom_catalog = load_custom_node_catalog(manager_root)
 
     (
-        node_to_plugins,
+        node_first_plugin,
         plugin_metadata,
         preemption_map,
         pattern_entries,
         comfy_nodes,
-    ) = load_extension_node_map(node_map_data, custom_catalog)
+    ) = load_extension_node_map(iter_node_map_items(node_map_paths), custom_catalog)
 
-    builtin_nodes.update(comfy_nodes)
-    builtin_nodes.update(builtin_overrides)
+    # One immutable lookup table for every builtin-name membership test.
+    builtin_nodes = frozenset().union(builtin_nodes, comfy_nodes, builtin_overrides)
+    pattern_union, pattern_union_plugins, pattern_leftovers = combine_pattern_entries(pattern_entries)
     plugin_list, unresolved_nodes = resolve_dependencies(
         workflow_nodes,
         builtin_nodes,
+        builtin_union,
         builtin_patterns,
-        node_to_plugins,
+        node_first_plugin,
         plugin_metadata,
         preemption_map,
-        pattern_entries,
+        pattern_union,
+        pattern_union_plugins,
+        pattern_leftovers,
         plugin_overrides,
     )
 
@@ -556,12 +818,16 @@ def main() -> None:
     if unresolved_nodes:
         result["unresolved_nodes"] = unresolved_nodes
 
-    output_text = json.dumps(result, indent=2, sort_keys=False)
+    if orjson is not None:
+        output_bytes = orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n"
+    else:
+        output_bytes = (json.dumps(result, indent=2, sort_keys=False) + "\n").encode("utf-8")
 
     if args.output:
-        args.output.write_text(output_text + "\n", encoding="utf-8")
+        args.output.write_bytes(output_bytes)
     else:
-        print(output_text)
+        sys.stdout.buffer.write(output_bytes)
+        sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":